@@ -7,21 +7,113 @@ and sends a webhook notification with the summary.
 """
 
 import argparse
-import json
+import csv
+import io
 import logging
 import sys
 import traceback
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, time, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Iterator, Optional
 
 import boto3
+import orjson
+import pandas as pd
 import requests
 import yaml
+from botocore.config import Config
+from botocore.response import StreamingBody
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+# Only the columns the digest actually aggregates over are kept
+TRADE_COLUMNS = ["quantity", "instrument_type", "trade_datetime", "trade_source"]
+# quantity is read as nullable Int64 so blank cells parse (they count as 0) and
+# out-of-range values can be rejected before narrowing to int32
+TRADE_DTYPES = {
+    "quantity": "Int64",
+    "instrument_type": "category",
+    "trade_source": "category",
+}
+# Every spelling of an instrument type ('Options', 'future', ...) maps to one of these
+INSTRUMENT_TYPES = pd.CategoricalDtype(["option", "future"])
+# Trades are parsed in chunks of this many rows so memory stays bounded
+TRADE_CHUNK_SIZE = 200_000
+
+# S3 Select query used when s3.use_select is set: projects TRADE_COLUMNS and
+# drops expirations server-side. The session window is still applied locally
+# since MM/DD/YYYY timestamps can't be range-compared as strings.
+TRADE_SELECT_EXPRESSION = (
+    "SELECT s.quantity, s.instrument_type, s.trade_datetime, s.trade_source "
+    "FROM S3Object s WHERE UPPER(s.trade_source) <> 'EXPIRATION'"
+)
+
+# Keep S3 connections alive and pooled between requests, retrying throttling
+S3_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=16,
+    retries={"mode": "adaptive", "max_attempts": 3},
+)
+
+# Trade files fetched concurrently when backfilling a --dates range
+BACKFILL_WORKERS = 8
+
+# Bound once so format_currency skips re-parsing the format spec on every call
+CURRENCY_FORMAT = "${:,.2f}".format
+
+# Payload formats accepted by --webhook-type
+WEBHOOK_TYPES = ("teams", "json")
+
+# Static skeleton of the Teams Adaptive Card; build_teams_card fills in the text fields
+TEAMS_CARD_TEMPLATE = {
+    "type": "message",
+    "attachments": [{
+        "contentType": "application/vnd.microsoft.card.adaptive",
+        "contentUrl": None,
+        "content": {
+            "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+            "type": "AdaptiveCard",
+            "version": "1.4",
+            "body": [
+                {"type": "TextBlock", "size": "Large", "weight": "Bolder", "text": None},
+                {"type": "TextBlock", "text": None, "wrap": True},
+                {"type": "TextBlock", "text": None, "isSubtle": True, "spacing": "Small"}
+            ]
+        }
+    }]
+}
+
+# Shared webhook session so retries reuse the same TCP/TLS connection. POSTs
+# are only retried on connect errors and 429/503, where the webhook never got
+# or did not accept the digest. Read timeouts, other errors and 500/502/504
+# are not retried, since the digest may already have been posted.
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=2,
+        max_retries=Retry(
+            total=3,
+            read=0,
+            other=0,
+            backoff_factor=0.3,
+            status_forcelist=[429, 503],
+            allowed_methods=["POST"],
+        ),
+    ),
+)
+
 
 @dataclass
 class FeeConfig:
@@ -44,6 +136,10 @@ class TradeSummary:
     total_fees: float
 
 
+class TradeFileError(Exception):
+    """A trade file could not be fetched or read."""
+
+
 def load_config(config_path: str = "/home/ec2-user/fees/config.yaml") -> dict:
     """Load configuration from YAML file."""
     path = Path(config_path)
@@ -51,7 +147,7 @@ def load_config(config_path: str = "/home/ec2-user/fees/config.yaml") -> dict:
         raise FileNotFoundError(f"Config file not found: {config_path}")
     
     with open(path) as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=SafeLoader)
 
 
 def get_fee_config(config: dict, instrument_type: str) -> FeeConfig:
@@ -64,6 +160,11 @@ def get_fee_config(config: dict, instrument_type: str) -> FeeConfig:
     )
 
 
+def parse_date(value: str) -> datetime:
+    """Parse a YYYY-MM-DD command line date as a naive midnight datetime."""
+    return datetime.combine(date.fromisoformat(value), time())
+
+
 def get_trade_file_key(prefix: str, date: datetime) -> str:
     """
     Generate the S3 key for a trade file based on date.
@@ -77,46 +178,138 @@ def download_trade_file(
     s3_client,
     bucket: str,
     key: str,
-) -> Optional[str]:
-    """Download trade file from S3 and return its contents."""
+) -> StreamingBody:
+    """Open trade file on S3 and return its body as an unread stream."""
     try:
         response = s3_client.get_object(Bucket=bucket, Key=key)
-        return response["Body"].read().decode("utf-8")
+        return response["Body"]
+    except s3_client.exceptions.NoSuchKey:
+        raise TradeFileError(f"Trade file not found: s3://{bucket}/{key}")
+    except Exception as e:
+        raise TradeFileError(f"Error downloading trade file: {e}") from e
+
+
+class SelectPayloadReader(io.RawIOBase):
+    """Expose the Records events of an S3 Select response as a byte stream."""
+
+    def __init__(self, event_stream):
+        self._events = iter(event_stream)
+        self._buffer = b""
+        self._ended = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer:
+            event = next(self._events, None)
+            if event is None:
+                if not self._ended:
+                    raise IOError("S3 Select response ended before the query completed")
+                return 0
+            if "End" in event:
+                self._ended = True
+            self._buffer = event.get("Records", {}).get("Payload", b"")
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+def select_trade_file(
+    s3_client,
+    bucket: str,
+    key: str,
+) -> BinaryIO:
+    """
+    Query trade file on S3 with TRADE_SELECT_EXPRESSION and return the result stream.
+    
+    The result is headerless CSV with TRADE_COLUMNS in order.
+    """
+    try:
+        response = s3_client.select_object_content(
+            Bucket=bucket,
+            Key=key,
+            Expression=TRADE_SELECT_EXPRESSION,
+            ExpressionType="SQL",
+            InputSerialization={
+                "CSV": {"FileHeaderInfo": "USE"},
+                "CompressionType": "NONE",
+            },
+            OutputSerialization={"CSV": {}},
+        )
+        return io.BufferedReader(SelectPayloadReader(response["Payload"]))
     except s3_client.exceptions.NoSuchKey:
-        print(f"Trade file not found: s3://{bucket}/{key}")
-        return None
+        raise TradeFileError(f"Trade file not found: s3://{bucket}/{key}")
     except Exception as e:
-        print(f"Error downloading trade file: {e}")
-        return None
+        raise TradeFileError(f"Error querying trade file: {e}") from e
 
 
-def parse_trades(csv_content: str) -> list[dict]:
+def parse_trades(trade_file: BinaryIO, header: Optional[list[str]] = None) -> Iterator[pd.DataFrame]:
     """
-    Parse CSV trade data into a list of trade dictionaries.
+    Parse CSV trade data into DataFrames of at most TRADE_CHUNK_SIZE trades.
     
     Expected CSV format (adjust based on actual exegy format):
     timestamp,symbol,side,quantity,price,instrument_type,exchange
     
-    Where instrument_type is 'option' or 'future'
-    """
-    lines = csv_content.strip().split("\n")
-    if len(lines) < 2:
-        return []
+    Where instrument_type is 'option' or 'future'. Only TRADE_COLUMNS are
+    kept; any of them missing from the file come back as empty columns.
+    The file is read as it is parsed, so it is never held in memory whole.
     
-    header = lines[0].lower().split(",")
-    trades = []
+    Pass header for files without a header row (e.g. S3 Select results).
+    Raises ValueError if the file has no header with an instrument_type
+    column, rather than reporting it as zero trades.
+    """
+    text = io.TextIOWrapper(trade_file, encoding="utf-8")
+    if header is None:
+        # Leading blank lines are skipped, as csv_content.strip() used to
+        line = text.readline()
+        while line and not line.strip():
+            line = text.readline()
+        header = [column.strip().lower() for column in next(csv.reader([line]), [])]
+    if "instrument_type" not in header:
+        raise ValueError(f"Trade file has no usable header row (got {header})")
     
-    for line in lines[1:]:
-        if not line.strip():
-            continue
-        values = line.split(",")
-        trade = dict(zip(header, values))
-        trades.append(trade)
+    # A repeated column name keeps its last occurrence, as dict(zip(...)) did
+    header = [
+        f"{column}.{position}" if column in header[position + 1:] else column
+        for position, column in enumerate(header)
+    ]
     
-    return trades
-
-
-def filter_trades_by_session(trades: list[dict], process_date: datetime) -> list[dict]:
+    # index_col=False stops pandas treating the first field as the index when
+    # rows have more fields than the header (e.g. a trailing comma). No usecols:
+    # with names= it rejects a first row that has fewer fields than the header,
+    # so TRADE_COLUMNS are selected afterwards and other columns skip inference.
+    chunks = pd.read_csv(
+        text,
+        header=None,
+        names=header,
+        index_col=False,
+        dtype=defaultdict(lambda: object, {
+            column: dtype for column, dtype in TRADE_DTYPES.items() if column in header
+        }),
+        na_values=[""],
+        engine="c",
+        chunksize=TRADE_CHUNK_SIZE,
+    )
+    # Columns absent from the file come back as empty object columns
+    missing = {column: object for column in TRADE_COLUMNS if column not in header}
+    for chunk in chunks:
+        chunk = chunk.reindex(columns=TRADE_COLUMNS).astype(missing)
+        quantity = chunk["quantity"].fillna(0)
+        in_range = quantity.between(-2**31, 2**31 - 1)
+        if not in_range.all():
+            raise ValueError(f"Trade quantity out of int32 range: {quantity[~in_range].iloc[0]}")
+        chunk["quantity"] = quantity.astype("int32")
+        # .str on a category only touches its few distinct labels, not every row
+        chunk["instrument_type"] = (
+            chunk["instrument_type"].str.lower().str.rstrip("s").astype(INSTRUMENT_TYPES)
+        )
+        yield chunk
+
+
+def filter_trades_by_session(trades: pd.DataFrame, process_date: datetime) -> pd.DataFrame:
     """
     Filter trades to only include those from the last trading session.
     
@@ -125,53 +318,67 @@ def filter_trades_by_session(trades: list[dict], process_date: datetime) -> list
     from 2024-01-14 17:00:00 onwards.
     """
     # Session starts at 5pm the previous day
-    session_start = process_date.replace(hour=17, minute=0, second=0, microsecond=0) - timedelta(days=1)
+    session_start = pd.Timestamp(
+        process_date.replace(hour=17, minute=0, second=0, microsecond=0) - timedelta(days=1)
+    )
+    
+    # Parse format: MM/DD/YYYY-HH:MM:SS (e.g., '02/12/2026-03:10:20')
+    trade_times = pd.to_datetime(
+        trades["trade_datetime"],
+        format="%m/%d/%Y-%H:%M:%S",
+        errors="coerce",
+        cache=True,
+    )
     
-    filtered_trades = []
-    for trade in trades:
-        # Skip expiration trades
-        if trade.get("trade_source", "").upper() == "EXPIRATION":
-            continue
-        
-        timestamp_str = trade.get("trade_datetime", "")
-        if not timestamp_str:
-            continue
-        
-        try:
-            # Parse format: MM/DD/YYYY-HH:MM:SS (e.g., '02/12/2026-03:10:20')
-            trade_time = datetime.strptime(timestamp_str, "%m/%d/%Y-%H:%M:%S")
-            
-            if trade_time >= session_start:
-                filtered_trades.append(trade)
-        except Exception as e:
-            logging.warning(f"Error parsing trade timestamp '{timestamp_str}': {e}")
-            continue
+    invalid = trade_times.isna() & trades["trade_datetime"].notna()
+    if invalid.any():
+        logging.warning(
+            "Skipping %d trades with unparseable timestamps for %s (e.g. '%s')",
+            invalid.sum(),
+            process_date.strftime("%Y-%m-%d"),
+            trades.loc[invalid, "trade_datetime"].iloc[0],
+        )
+    
+    # Skip expiration trades
+    not_expiration = trades["trade_source"].str.upper() != "EXPIRATION"
+    
+    return trades[(trade_times >= session_start) & not_expiration]
+
+
+def count_trades(trades: pd.DataFrame) -> pd.DataFrame:
+    """
+    Count trades and contracts per instrument type in a single groupby pass.
     
-    return filtered_trades
+    Returns a frame indexed by 'option' and 'future' with trade_count and
+    total_contracts columns, so counts for several chunks can be added up.
+    Other instrument types are not counted.
+    """
+    counts = trades.groupby("instrument_type", observed=True)["quantity"].agg(
+        trade_count="size",
+        total_contracts="sum",
+    )
+    return counts.reindex(["option", "future"], fill_value=0).astype("int64")
 
 
 def calculate_fees(
-    trades: list[dict],
+    trade_counts: pd.DataFrame,
     options_config: FeeConfig,
     futures_config: FeeConfig,
 ) -> tuple[TradeSummary, TradeSummary]:
-    """Calculate total fees for options and futures trades."""
-    options_trades = [t for t in trades if t.get("instrument_type", "").lower() in ("option", "options")]
-    futures_trades = [t for t in trades if t.get("instrument_type", "").lower() in ("future", "futures")]
-    
-    options_contracts = sum(int(t.get("quantity", 0)) for t in options_trades)
-    futures_contracts = sum(int(t.get("quantity", 0)) for t in futures_trades)
+    """Calculate total fees for options and futures from count_trades() totals."""
+    options_trades, options_contracts = map(int, trade_counts.loc["option"])
+    futures_trades, futures_contracts = map(int, trade_counts.loc["future"])
     
     options_summary = TradeSummary(
         instrument_type="options",
-        trade_count=len(options_trades),
+        trade_count=options_trades,
         total_contracts=options_contracts,
         total_fees=options_contracts * options_config.total_per_contract,
     )
     
     futures_summary = TradeSummary(
         instrument_type="futures",
-        trade_count=len(futures_trades),
+        trade_count=futures_trades,
         total_contracts=futures_contracts,
         total_fees=futures_contracts * futures_config.total_per_contract,
     )
@@ -181,7 +388,7 @@ def calculate_fees(
 
 def format_currency(amount: float) -> str:
     """Format amount as currency string."""
-    return f"${amount:,.2f}"
+    return CURRENCY_FORMAT(amount)
 
 
 def build_fee_message(
@@ -213,6 +420,7 @@ def build_fee_message(
     ]
     
     summary_data = {
+        "date": date.strftime("%Y-%m-%d"),
         "total_fees": total_fees,
         "total_fees_formatted": format_currency(total_fees),
         "total_trades": total_trades,
@@ -222,46 +430,119 @@ def build_fee_message(
     return "\n".join(message_lines), summary_data
 
 
-def send_teams_message(
+def build_teams_card(title: str, message: str) -> dict:
+    """
+    Build an Adaptive Card message for Microsoft Teams.
+    
+    Only the path down to the three text fields is copied; everything
+    else is shared with TEAMS_CARD_TEMPLATE, which must not be mutated.
+    """
+    attachment = TEAMS_CARD_TEMPLATE["attachments"][0]
+    content = attachment["content"]
+    title_block, message_block, timestamp_block = content["body"]
+    timestamp = f"Timestamp (UTC): {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')}"
+
+    return {
+        **TEAMS_CARD_TEMPLATE,
+        "attachments": [{
+            **attachment,
+            "content": {
+                **content,
+                "body": [
+                    {**title_block, "text": title},
+                    {**message_block, "text": message},
+                    {**timestamp_block, "text": timestamp},
+                ],
+            },
+        }],
+    }
+
+
+def send_message(
     webhook_url: str,
     message: str,
+    summary_data: dict,
+    webhook_type: str = "teams",
     title_suffix: str = "",
 ) -> bool:
-    """Send an Adaptive Card message to Microsoft Teams."""
+    """
+    Send the fee digest to a webhook.
+    
+    webhook_type 'teams' posts an Adaptive Card; 'json' posts the title,
+    message text and summary_data as a flat JSON object.
+    """
     today = datetime.now().strftime("%Y-%m-%d")
     title = f"Daily Fee Digest {today}"
     if title_suffix:
         title += f" ({title_suffix})"
 
-    payload = {
-        "type": "message",
-        "attachments": [{
-            "contentType": "application/vnd.microsoft.card.adaptive",
-            "contentUrl": None,
-            "content": {
-                "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-                "type": "AdaptiveCard",
-                "version": "1.4",
-                "body": [
-                    {"type": "TextBlock", "size": "Large", "weight": "Bolder", "text": title},
-                    {"type": "TextBlock", "text": message, "wrap": True},
-                    {"type": "TextBlock", "text": f"Timestamp (UTC): {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')}", "isSubtle": True, "spacing": "Small"}
-                ]
-            }
-        }]
-    }
+    if webhook_type == "teams":
+        payload = build_teams_card(title, message)
+    else:
+        payload = {"title": title, "text": message, **summary_data}
 
     try:
-        r = requests.post(webhook_url, json=payload, timeout=10)
+        r = HTTP_SESSION.post(
+            webhook_url,
+            data=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=10,
+        )
         r.raise_for_status()
-        logging.info("Adaptive Card successfully sent to Teams: %s", title)
+        logging.info("Fee digest successfully sent to %s webhook: %s", webhook_type, title)
         return True
     except Exception as e:
-        logging.error("Failed to send Teams Adaptive Card: %s", e)
+        logging.error("Failed to send fee digest to %s webhook: %s", webhook_type, e)
         logging.debug(traceback.format_exc())
         return False
 
 
+def process_trade_date(
+    s3_client,
+    config: dict,
+    trade_file_key: str,
+    process_date: datetime,
+) -> tuple[int, int, pd.DataFrame]:
+    """
+    Fetch and tally the trade file for a single date.
+    
+    Returns (parsed_count, session_count, trade_counts), where trade_counts
+    are the count_trades() totals for the session. Raises TradeFileError if
+    the file could not be fetched or read. Prints nothing, so it is safe to
+    run for several dates in parallel while main reports them in order.
+    """
+    bucket = config["s3"]["bucket"]
+
+    # Download and parse trade file
+    if config["s3"].get("use_select", False):
+        trade_file = select_trade_file(s3_client, bucket, trade_file_key)
+        header = TRADE_COLUMNS
+    else:
+        trade_file = download_trade_file(s3_client, bucket, trade_file_key)
+        header = None
+
+    # Stream the file chunk by chunk, keeping only running totals. The body is
+    # only read here, so connection, decode and parse errors surface here too.
+    parsed_count = 0
+    session_count = 0
+    trade_counts = count_trades(pd.DataFrame(columns=TRADE_COLUMNS))
+    try:
+        for all_trades in parse_trades(trade_file, header):
+            parsed_count += len(all_trades)
+
+            # Filter to only include trades from the last trading session (since 5pm previous day)
+            trades = filter_trades_by_session(all_trades, process_date)
+            session_count += len(trades)
+
+            trade_counts += count_trades(trades)
+    except Exception as e:
+        raise TradeFileError(f"Error reading trade file s3://{bucket}/{trade_file_key}: {e}") from e
+    finally:
+        trade_file.close()
+
+    return parsed_count, session_count, trade_counts
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Digest exegy trade list and send fee summary webhook"
@@ -271,16 +552,33 @@ def main():
         default="/home/ec2-user/fees/config.yaml",
         help="Path to configuration file (default: /home/ec2-user/fees/config.yaml)",
     )
-    parser.add_argument(
+    date_group = parser.add_mutually_exclusive_group()
+    date_group.add_argument(
         "--date",
+        type=parse_date,
         help="Date to process (YYYY-MM-DD format, default: today)",
     )
+    date_group.add_argument(
+        "--dates",
+        nargs=2,
+        type=parse_date,
+        metavar=("START", "END"),
+        help="Backfill every date from START to END inclusive (YYYY-MM-DD format)",
+    )
+    parser.add_argument(
+        "--webhook-type",
+        choices=WEBHOOK_TYPES,
+        default="teams",
+        help="Send a Teams Adaptive Card or a plain JSON summary (default: teams)",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
         help="Print payload without sending webhook",
     )
     args = parser.parse_args()
+    if args.dates and args.dates[1] < args.dates[0]:
+        parser.error("--dates END must not be before START")
 
     # Load configuration
     try:
@@ -289,13 +587,15 @@ def main():
         print(f"Error: {e}")
         sys.exit(1)
 
-    # Determine date to process
-    if args.date:
-        process_date = datetime.strptime(args.date, "%Y-%m-%d")
+    # Determine dates to process
+    if args.dates:
+        start_date, end_date = args.dates
+        process_dates = [start_date + timedelta(days=n) for n in range((end_date - start_date).days + 1)]
+        print(f"Processing trades for: {start_date.strftime('%Y-%m-%d')} to "
+              f"{end_date.strftime('%Y-%m-%d')} ({len(process_dates)} dates)")
     else:
-        process_date = datetime.now()
-
-    print(f"Processing trades for: {process_date.strftime('%Y-%m-%d')}")
+        process_dates = [args.date or datetime.now()]
+        print(f"Processing trades for: {process_dates[0].strftime('%Y-%m-%d')}")
 
     # Get fee configurations
     options_config = get_fee_config(config, "options")
@@ -304,66 +604,84 @@ def main():
     print(f"Options fee per contract: {format_currency(options_config.total_per_contract)}")
     print(f"Futures fee per contract: {format_currency(futures_config.total_per_contract)}")
 
-    # Initialize S3 client
-    s3_client = boto3.client("s3")
-    bucket = config["s3"]["bucket"]
-    prefix = config["s3"]["prefix"]
-
-    # Download and parse trade file
-    trade_file_key = get_trade_file_key(prefix, process_date)
-    print(f"Fetching: s3://{bucket}/{trade_file_key}")
-
-    csv_content = download_trade_file(s3_client, bucket, trade_file_key)
-    if csv_content is None:
-        print("No trade file found for this date. Exiting.")
-        sys.exit(1)
-
-    all_trades = parse_trades(csv_content)
-    print(f"Parsed {len(all_trades)} trades from file")
-    
-    # Filter to only include trades from the last trading session (since 5pm previous day)
-    trades = filter_trades_by_session(all_trades, process_date)
-    print(f"Filtered to {len(trades)} trades from last trading session (since 5pm previous day)")
-
-    # Calculate fees
-    options_summary, futures_summary = calculate_fees(
-        trades, options_config, futures_config
-    )
-
-    # Build fee message
-    message, summary_data = build_fee_message(
-        process_date,
-        options_summary,
-        futures_summary,
-        options_config,
-        futures_config,
-    )
-
-    # Print summary
-    print("\n--- Fee Summary ---")
-    print(f"Options: {options_summary.trade_count} trades, "
-          f"{options_summary.total_contracts} contracts, "
-          f"{format_currency(options_summary.total_fees)} fees")
-    print(f"Futures: {futures_summary.trade_count} trades, "
-          f"{futures_summary.total_contracts} contracts, "
-          f"{format_currency(futures_summary.total_fees)} fees")
-    print(f"Total Fees: {summary_data['total_fees_formatted']}")
-    print("-------------------\n")
-
-    if args.dry_run:
-        print("Dry run - Teams message:")
-        print(message)
-        return
-
-    # Send Teams webhook
     webhook_config = config.get("webhook", {})
     webhook_url = webhook_config.get("url")
 
-    if not webhook_url:
+    if not args.dry_run and not webhook_url:
         print("Error: No webhook URL configured")
         sys.exit(1)
 
-    success = send_teams_message(webhook_url, message)
+    # Initialize S3 client (thread-safe, shared by all workers)
+    s3_client = boto3.client("s3", config=S3_CLIENT_CONFIG)
+    bucket = config["s3"]["bucket"]
+    prefix = config["s3"]["prefix"]
+    trade_file_keys = [get_trade_file_key(prefix, process_date) for process_date in process_dates]
+
+    # Fetch dates concurrently, but report them one at a time in date order
+    success = True
+    with ThreadPoolExecutor(max_workers=BACKFILL_WORKERS) as executor:
+        futures = [
+            executor.submit(process_trade_date, s3_client, config, trade_file_key, process_date)
+            for trade_file_key, process_date in zip(trade_file_keys, process_dates)
+        ]
+        for process_date, trade_file_key, future in zip(process_dates, trade_file_keys, futures):
+            date_str = process_date.strftime("%Y-%m-%d")
+            if args.dates:
+                print(f"\n=== {date_str} ===")
+            print(f"Fetching: s3://{bucket}/{trade_file_key}")
+
+            try:
+                parsed_count, session_count, trade_counts = future.result()
+            except TradeFileError as e:
+                print(e)
+                print(f"No trade data for {date_str}; skipping.")
+                success = False
+                continue
+            except Exception as e:
+                logging.error("Failed to process trades for %s: %s", date_str, e)
+                logging.debug(traceback.format_exc())
+                success = False
+                continue
+
+            print(f"Parsed {parsed_count} trades from file")
+            print(f"Filtered to {session_count} trades from last trading session (since 5pm previous day)")
+
+            # Calculate fees
+            options_summary, futures_summary = calculate_fees(
+                trade_counts, options_config, futures_config
+            )
+
+            # Build fee message
+            message, summary_data = build_fee_message(
+                process_date,
+                options_summary,
+                futures_summary,
+                options_config,
+                futures_config,
+            )
+
+            # Print summary
+            print("\n--- Fee Summary ---")
+            print(f"Options: {options_summary.trade_count} trades, "
+                  f"{options_summary.total_contracts} contracts, "
+                  f"{format_currency(options_summary.total_fees)} fees")
+            print(f"Futures: {futures_summary.trade_count} trades, "
+                  f"{futures_summary.total_contracts} contracts, "
+                  f"{format_currency(futures_summary.total_fees)} fees")
+            print(f"Total Fees: {summary_data['total_fees_formatted']}")
+            print("-------------------\n")
+
+            if args.dry_run:
+                print(f"Dry run - {args.webhook_type} message:")
+                print(message)
+                continue
+
+            # Send webhook, labelling backfilled digests with their trade date
+            title_suffix = date_str if args.dates else ""
+            success &= send_message(
+                webhook_url, message, summary_data, args.webhook_type, title_suffix
+            )
+
     sys.exit(0 if success else 1)
 
 